@@ -1,18 +1,36 @@
 import sys
 import json
 import os
+import logging
+import functools
+import queue
+import time
+import threading
+import httpx
 import requests
 import telegram
+from telegram.utils.request import Request
+from requests.adapters import HTTPAdapter
+from tenacity import (retry, stop_after_attempt, wait_exponential, wait_random,
+                      retry_if_exception, before_sleep_log)
 from datetime import datetime, timedelta
+from enum import IntEnum
 from pathlib import Path
-from typing import (Optional, Dict, Any, List, Tuple, DefaultDict, BinaryIO, IO)
+from typing import (Optional, Dict, Any, List, Tuple, DefaultDict, BinaryIO, IO, Iterable, Set)
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, Future
+from contextlib import ExitStack, closing
 
 # 将项目根目录添加到模块搜索路径
 _project_root = Path(__file__).resolve().parent.parent
 sys.path.append(str(_project_root))
 from utils.log_utils import LogUtils
 
+try:
+    import orjson
+except ImportError:  # 未安装orjson时回退到标准库json
+    orjson = None
+
 
 # --------------------------
 # 配置模块
@@ -37,17 +55,56 @@ class Config:
 
     # 业务参数
     MAX_DOWNLOAD_ATTEMPTS = 10  # 重试次数
+    DOWNLOAD_WORKERS = 8  # 并发下载线程数
+    HTTP_POOL_SIZE = 32  # 媒体下载客户端（httpx）的最大连接数与保活连接数（需不小于下载线程数）
+    NOTIFY_POOL_SIZE = 1  # 飞书通知会话的连接池大小（仅通知线程使用）
+    UPLOAD_WORKERS = 1  # 并发上传的分组数（1为按顺序上传；大于1时频道内消息顺序不再保证）
+    TELEGRAM_POOL_SIZE = 4  # Telegram API连接池大小（需不小于上传线程数）
+    DOWNLOAD_RETRY_ATTEMPTS = 4  # 单次下载内的请求重试次数
+    RETRY_STATUS_CODES = frozenset({408, 425, 429, 500, 502, 503, 504})  # 可重试的HTTP状态码
+    DOWNLOAD_CHUNK_SIZE = 1024 * 1024  # 下载分块大小（1MB）
+    DOWNLOAD_BUFFER_SIZE = 4 * 1024 * 1024  # 写入缓冲区大小（4MB）
     ERROR_TRUNCATE = 50  # 错误信息截断长度
     NOTIFICATION_TRUNCATE = 200  # 通知消息截断长度
-
-    @classmethod
-    def get_env_vars(cls) -> Dict[str, str]:
-        """环境变量获取"""
-        return {
-            'bot_token': os.getenv('BOT_TOKEN'),
-            'chat_id': os.getenv('CHAT_ID'),
-            'lark_key': os.getenv('LARK_KEY')
-        }
+    ALERT_BATCH_SIZE = 20  # 告警合并发送条数上限
+    NOTIFY_SHUTDOWN_TIMEOUT = 30  # 退出时等待通知发送完毕的最长秒数
+    WAL_FSYNC_INTERVAL = 32  # 变更日志每写入多少条记录fsync一次
+
+
+class MediaKind(IntEnum):
+    """媒体类型枚举（加载时由 media_type 转换一次，后续只做整数比较）"""
+    OTHER = 0
+    IMAGE = 1
+    VIDEO = 2
+    SPACE = 3
+    BROADCAST = 4
+
+
+_MEDIA_KIND = {
+    'images': MediaKind.IMAGE,
+    'videos': MediaKind.VIDEO,
+    'spaces': MediaKind.SPACE,
+    'broadcasts': MediaKind.BROADCAST,
+}
+_TEXT_KINDS = frozenset({MediaKind.SPACE, MediaKind.BROADCAST})  # 仅发送文本链接的类型
+_MEDIA_KINDS = frozenset({MediaKind.IMAGE, MediaKind.VIDEO})  # 需下载上传的媒体类型
+_UNRECOVERABLE_ERRORS = frozenset({'file_too_large', 'max_download_attempts'})  # 不再重试的错误类型
+_KIND_KEY = '_kind'  # 运行时字段，保存时剔除
+_WAL_FIELDS = ('is_downloaded', 'download_info', 'is_uploaded', 'upload_info')  # 变更日志记录的状态字段
+
+# Telegram文件大小限制
+_LIMIT_IMAGES = Config.TELEGRAM_LIMITS['images']
+_LIMIT_VIDEOS = Config.TELEGRAM_LIMITS['videos']
+_CAPTION_LIMIT = Config.TELEGRAM_LIMITS['caption']
+_MEDIA_GROUP_LIMIT = Config.TELEGRAM_LIMITS['media_group']
+_GROUP_SIZE_LIMIT_MB = _LIMIT_VIDEOS / (1024 * 1024)  # 媒体组总大小上限（MB）
+
+
+class EnvConfig:
+    """环境变量配置（导入时读取一次）"""
+    BOT_TOKEN = os.getenv('BOT_TOKEN')  # Telegram机器人Token
+    CHAT_ID = os.getenv('CHAT_ID')  # Telegram频道/群组ID
+    LARK_KEY = os.getenv('LARK_KEY')  # 飞书机器人Webhook Key
 
 
 # --------------------------
@@ -68,56 +125,195 @@ logger = LogUtils().get_logger()
 logger.info("🔄 T-Bot 初始化完成")
 
 
+# --------------------------
+# 工具函数
+# --------------------------
+@functools.lru_cache(maxsize=1)
+def _ts(second_bucket: int) -> str:
+    """格式化指定秒的时间戳（只缓存最近一秒，秒数变化时自然淘汰）"""
+    return time.strftime(Config.INFO_DATE_FORMAT, time.localtime(second_bucket))
+
+
+def _now_iso() -> str:
+    """当前时间戳，格式为 Config.INFO_DATE_FORMAT"""
+    # 同一秒内的多次状态更新复用已格式化的结果，且不创建datetime对象
+    return _ts(int(time.time()))
+
+
+def _json_loads(raw: bytes) -> Any:
+    """JSON解码（优先使用orjson）"""
+    return orjson.loads(raw) if orjson else json.loads(raw)
+
+
+def _json_dumps(obj: Any, indent: bool = False) -> bytes:
+    """JSON编码为UTF-8字节（优先使用orjson，输出与 json.dump(ensure_ascii=False) 一致）"""
+    if orjson:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2) if indent else orjson.dumps(obj)
+    if indent:
+        return json.dumps(obj, ensure_ascii=False, indent=2).encode('utf-8')
+    return json.dumps(obj, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+@functools.lru_cache(maxsize=4096)
+def _fmt_publish_time(publish_time: str) -> str:
+    """格式化发布时间（同一推文的多个文件共享发布时间，结果可缓存）"""
+    parsed = datetime.fromisoformat(publish_time)
+    if parsed.tzinfo is None:
+        # 无时区时与 MESSAGE_DATE_FORMAT 输出一致，isoformat 由C实现免去格式串解析
+        return parsed.isoformat(sep=' ', timespec='seconds')
+    return parsed.strftime(Config.MESSAGE_DATE_FORMAT)
+
+
+# --------------------------
+# 网络模块
+# --------------------------
+def _create_http_session() -> requests.Session:
+    """创建复用连接的HTTP会话（仅供飞书通知线程使用）"""
+    session = requests.Session()
+    # 重试由调用方控制，适配器本身不重试
+    adapter = HTTPAdapter(pool_connections=Config.NOTIFY_POOL_SIZE, pool_maxsize=Config.NOTIFY_POOL_SIZE, max_retries=0)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
+
+
+def _create_cdn_client() -> httpx.Client:
+    """创建媒体下载客户端，HTTP/2在单个连接上多路复用并发下载"""
+    limits = httpx.Limits(max_connections=Config.HTTP_POOL_SIZE,
+                          max_keepalive_connections=Config.HTTP_POOL_SIZE)
+    return httpx.Client(http2=True, timeout=30.0, limits=limits, follow_redirects=True)
+
+
+_HTTP = _create_http_session()
+_CDN = _create_cdn_client()
+
+
+def _is_retryable_error(error: BaseException) -> bool:
+    """判断是否为可重试的瞬时网络错误"""
+    # 仅超时、网络与对端协议错误可重试；URL/协议配置错误每次都会失败，不重试
+    if isinstance(error, (httpx.TimeoutException, httpx.NetworkError, httpx.RemoteProtocolError)):
+        return True
+    if isinstance(error, httpx.HTTPStatusError):
+        return error.response.status_code in Config.RETRY_STATUS_CODES
+    return False
+
+
 # --------------------------
 # 通知模块
 # --------------------------
 class Notifier:
-    """通知处理器"""
+    """通知处理器（后台线程异步发送，不阻塞上传流程）"""
 
-    @staticmethod
-    def send_lark_message(message: str) -> bool:
-        """发送普通飞书消息"""
-        lark_key = Config.get_env_vars()['lark_key']
-        if not lark_key:
+    LARK_WEBHOOK_URL = (
+        f"https://open.feishu.cn/open-apis/bot/v2/hook/{EnvConfig.LARK_KEY}" if EnvConfig.LARK_KEY else None
+    )
+
+    LARK_HEADERS = {'Content-Type': 'application/json'}
+
+    _queue: "queue.Queue[Optional[Tuple[str, str, str]]]" = queue.Queue()
+    _worker: Optional[threading.Thread] = None
+    _worker_lock = threading.Lock()
+
+    @classmethod
+    def send_lark_message(cls, message: str) -> bool:
+        """发送普通飞书消息，返回是否已加入发送队列"""
+        if not cls.LARK_WEBHOOK_URL:
             return False
 
-        webhook_url = f"https://open.feishu.cn/open-apis/bot/v2/hook/{lark_key}"
-        try:
-            payload = {
-                "msg_type": "text",
-                "content": {"text": f"📢 动态更新\n{message}"}
-            }
-            response = requests.post(webhook_url, json=payload, timeout=10)
-            response.raise_for_status()
-            logger.info("📨 飞书动态消息发送成功")
-            return True
-        except Exception as e:
-            logger.error(f"✗ 飞书消息发送失败: {str(e)}")
+        return cls._enqueue(f"📢 动态更新\n{message}", "📨 飞书动态消息发送成功", "✗ 飞书消息发送失败")
+
+    @classmethod
+    def send_lark_alert(cls, message: str) -> bool:
+        """发送飞书通知，返回是否已加入发送队列"""
+        if not cls.LARK_WEBHOOK_URL:
             return False
 
-    @staticmethod
-    def send_lark_alert(message: str) -> bool:
-        """发送飞书通知"""
-        if not Config.get_env_vars()['lark_key']:
+        return cls._post_alert(cls._truncate_alert(message))
+
+    @classmethod
+    def send_lark_alerts(cls, messages: List[str]) -> bool:
+        """合并发送多条飞书通知（逐条截断）"""
+        if not cls.LARK_WEBHOOK_URL or not messages:
             return False
 
-        # 消息截断
-        truncated_msg = f"{message[:Config.NOTIFICATION_TRUNCATE]}..." if len(
+        return cls._post_alert("\n---\n".join(cls._truncate_alert(message) for message in messages))
+
+    @classmethod
+    def shutdown(cls, timeout: float = Config.NOTIFY_SHUTDOWN_TIMEOUT) -> None:
+        """等待队列中的通知发送完毕并停止后台线程"""
+        with cls._worker_lock:
+            worker, cls._worker = cls._worker, None
+        if worker is None:
+            return
+
+        cls._queue.put(None)
+        worker.join(timeout)
+        if worker.is_alive():
+            logger.warning("⚠️ 飞书通知未在超时时间内发送完毕")
+
+    @staticmethod
+    def _truncate_alert(message: str) -> str:
+        """告警消息截断"""
+        return f"{message[:Config.NOTIFICATION_TRUNCATE]}..." if len(
             message) > Config.NOTIFICATION_TRUNCATE else message
-        webhook_url = f"https://open.feishu.cn/open-apis/bot/v2/hook/{Config.get_env_vars()['lark_key']}"
 
-        try:
-            payload = {
-                "msg_type": "text",
-                "content": {"text": f"📢 XT-Bot处理告警\n{truncated_msg}"}
-            }
-            response = requests.post(webhook_url, json=payload, timeout=10)
-            response.raise_for_status()
-            logger.info("📨 飞书通知发送成功")
-            return True
-        except Exception as e:
-            logger.error(f"✗ 飞书通知发送失败: {str(e)}")
-            return False
+    @classmethod
+    def _post_alert(cls, alert_text: str) -> bool:
+        """发送告警文本"""
+        return cls._enqueue(f"📢 XT-Bot处理告警\n{alert_text}", "📨 飞书通知发送成功", "✗ 飞书通知发送失败")
+
+    @classmethod
+    def _enqueue(cls, text: str, success_msg: str, failure_msg: str) -> bool:
+        """加入发送队列，按需启动后台线程"""
+        with cls._worker_lock:
+            if cls._worker is None or not cls._worker.is_alive():
+                cls._worker = threading.Thread(target=cls._run_worker, name="lark-notifier", daemon=True)
+                cls._worker.start()
+            cls._queue.put((text, success_msg, failure_msg))
+        return True
+
+    @classmethod
+    def _run_worker(cls) -> None:
+        """后台线程：逐条发送队列中的通知，收到None时退出"""
+        while True:
+            task = cls._queue.get()
+            if task is None:
+                return
+
+            text, success_msg, failure_msg = task
+            try:
+                # 直接序列化为bytes，避免requests内部再经stdlib json编码
+                body = _json_dumps({"msg_type": "text", "content": {"text": text}})
+                response = _HTTP.post(cls.LARK_WEBHOOK_URL, data=body, headers=cls.LARK_HEADERS, timeout=10)
+                response.raise_for_status()
+                logger.info(success_msg)
+            except Exception as e:
+                logger.error("%s: %s", failure_msg, e)
+
+
+class AlertQueue:
+    """告警缓冲队列，合并多条告警后统一发送"""
+
+    def __init__(self, batch_size: int = Config.ALERT_BATCH_SIZE):
+        self._buffer: List[str] = []
+        self._batch_size = batch_size
+        self._lock = threading.Lock()  # 并发上传时多个线程会同时写入
+
+    def push(self, message: str) -> None:
+        """加入告警，达到批量上限时立即发送"""
+        with self._lock:
+            self._buffer.append(message)
+            if len(self._buffer) < self._batch_size:
+                return
+        self.flush()
+
+    def flush(self) -> None:
+        """发送所有缓冲的告警"""
+        with self._lock:
+            if not self._buffer:
+                return
+            batch, self._buffer = self._buffer, []
+        Notifier.send_lark_alerts(batch)
 
 
 # --------------------------
@@ -126,38 +322,167 @@ class Notifier:
 class FileProcessor:
     """文件处理器"""
 
+    _dirs_ready: Set[Path] = set()  # 本进程内已创建的目录，批量处理时避免重复mkdir
+
     def __init__(self, json_path: str, download_dir: str):
         self.json_path = Path(json_path)
         self.download_path = Path(download_dir)
+        self.wal_path = self.json_path.with_suffix('.json.wal')  # 状态变更日志
+        self._wal_file: Optional[IO[bytes]] = None
+        self._wal_unsynced = 0  # 尚未fsync的记录数
+        self._wal_lock = threading.Lock()  # 上传线程并发写入变更日志
+        self._states: Dict[int, bytes] = {}  # 各项最近一次记录的状态
+        self.dirty = False  # 数据是否有变化需要保存
+        self.grouped: Dict[str, List[Dict[str, Any]]] = {}  # 按tweet_id分组（按首次出现顺序）
+        self.no_tweet_id: List[Dict[str, Any]] = []  # 缺少tweet_id的项
         self._ensure_dirs()
 
     def _ensure_dirs(self) -> None:
         """目录创建"""
+        if self.download_path in FileProcessor._dirs_ready:
+            return
         self.download_path.mkdir(parents=True, exist_ok=True)
-        logger.info(f"📂 下载目录已就绪: {self.download_path}")
+        FileProcessor._dirs_ready.add(self.download_path)
+        logger.info("📂 下载目录已就绪: %s", self.download_path)
 
     def load_data(self) -> List[Dict[str, Any]]:
-        """加载JSON数据"""
+        """加载JSON数据，同时按tweet_id分组"""
         try:
-            with self.json_path.open('r+', encoding='utf-8') as f:
-                data = json.load(f)
-                logger.info(f"📄 已加载JSON数据，共{len(data)}条记录")
-                return data
+            data = _json_loads(self.json_path.read_bytes())
+            # 一次遍历完成规范化与分组：标注媒体类型枚举，保证状态字段为dict，后续无需逐处探测
+            grouped: Dict[str, List[Dict[str, Any]]] = {}
+            no_tweet_id = []
+            for item in data:
+                item[_KIND_KEY] = _MEDIA_KIND.get(item.get('media_type'), MediaKind.OTHER)
+                if not isinstance(item.get('download_info'), dict):
+                    item['download_info'] = {}
+                if not isinstance(item.get('upload_info'), dict):
+                    item['upload_info'] = {}
+                if 'tweet_id' in item:
+                    grouped.setdefault(item['tweet_id'], []).append(item)
+                else:
+                    no_tweet_id.append(item)
+            self.grouped = grouped
+            self.no_tweet_id = no_tweet_id
+            logger.info("📄 已加载JSON数据，共%s条记录", len(data))
+            self._replay_wal(data)
+            # 记录初始状态，用于判断后续是否有变化
+            self._states = {id(item): _json_dumps(self._item_state(item)) for item in data}
+            return data
         except Exception as e:
-            logger.error(f"✗ JSON文件加载失败: {str(e)}")
+            logger.error("✗ JSON文件加载失败: %s", e)
             raise
 
     def save_data(self, data: List[Dict[str, Any]]) -> None:
         """保存JSON数据"""
         try:
-            with self.json_path.open('r+', encoding='utf-8') as f:
-                f.seek(0)
-                json.dump(data, f, indent=2, ensure_ascii=False)
-                f.truncate()
+            # 先写临时文件再原子替换，避免中途退出导致JSON损坏
+            tmp_path = self.json_path.with_suffix('.json.tmp')
+            tmp_path.write_bytes(_json_dumps(self._strip_runtime_fields(data), indent=True))
+            tmp_path.replace(self.json_path)
+
+            # JSON已包含全部状态，变更日志不再需要
+            self.close_wal()
+            self.wal_path.unlink(missing_ok=True)
+            self.dirty = False
         except Exception as e:
-            logger.error(f"✗ JSON保存失败: {str(e)}")
+            logger.error("✗ JSON保存失败: %s", e)
             raise
 
+    def record_items(self, items: List[Dict[str, Any]]) -> None:
+        """
+        将分组处理后状态有变化的项追加写入变更日志（每项一行）
+        进程中途退出时，下次加载会回放日志，避免已上传的文件被重复推送
+        可在多个上传线程中调用
+        """
+        with self._wal_lock:
+            changed = []
+            for item in items:
+                patch = self._item_state(item)
+                state = _json_dumps(patch)
+                if self._states.get(id(item)) != state:
+                    self._states[id(item)] = state
+                    changed.append({"key": self._item_key(item), "patch": patch})
+            if not changed:
+                return
+
+            self.dirty = True
+            if self._wal_file is None:
+                self._wal_file = self.wal_path.open('ab')
+
+            for record in changed:
+                self._wal_file.write(_json_dumps(record) + b"\n")
+            self._wal_file.flush()
+
+            # 批量fsync，降低小记录频繁落盘的开销
+            self._wal_unsynced += len(changed)
+            if self._wal_unsynced >= Config.WAL_FSYNC_INTERVAL:
+                os.fsync(self._wal_file.fileno())
+                self._wal_unsynced = 0
+
+    def close_wal(self) -> None:
+        """落盘并关闭变更日志"""
+        with self._wal_lock:
+            if self._wal_file is None:
+                return
+            self._wal_file.flush()
+            os.fsync(self._wal_file.fileno())
+            self._wal_file.close()
+            self._wal_file = None
+            self._wal_unsynced = 0
+
+    def _replay_wal(self, data: List[Dict[str, Any]]) -> None:
+        """回放上次中断遗留的变更日志"""
+        if not self.wal_path.exists():
+            return
+
+        # 日志中的状态需要写回JSON
+        self.dirty = True
+        items_by_key = {self._item_key(item): item for item in data}
+        replayed = 0
+        with self.wal_path.open('rb') as f:
+            for line in f:
+                try:
+                    record = _json_loads(line)
+                except ValueError:
+                    # 中断时可能残留不完整的末行
+                    logger.warning("⚠️ 跳过损坏的变更日志记录: %s", self.wal_path)
+                    continue
+
+                item = items_by_key.get(record.get('key'))
+                if item is not None:
+                    item.update(record['patch'])
+                    replayed += 1
+
+        logger.info("♻️ 已从变更日志恢复 %s 条状态记录", replayed)
+
+    def has_pending_items(self) -> bool:
+        """是否存在仍需处理的项（未上传，且不是已通知过的不可恢复错误）"""
+        for items in self.grouped.values():
+            for item in items:
+                if item.get('is_uploaded'):
+                    continue
+                upload_info = item['upload_info']
+                if upload_info.get('error_type') in _UNRECOVERABLE_ERRORS and upload_info.get('notification_sent'):
+                    continue
+                return True
+        return False
+
+    @staticmethod
+    def _item_state(item: Dict[str, Any]) -> Dict[str, Any]:
+        """提取需要记录的状态字段"""
+        return {field: item[field] for field in _WAL_FIELDS if field in item}
+
+    @staticmethod
+    def _item_key(item: Dict[str, Any]) -> str:
+        """条目唯一标识（与X-Bot的条目ID一致）"""
+        return f"{item['file_name']}_{item['user']['screen_name']}_{item['media_type']}"
+
+    @staticmethod
+    def _strip_runtime_fields(data: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """剔除仅运行时使用的字段"""
+        return [{k: v for k, v in item.items() if k != _KIND_KEY} for item in data]
+
 
 # --------------------------
 # 下载模块
@@ -165,6 +490,16 @@ class FileProcessor:
 class DownloadManager:
     """下载管理器"""
 
+    @classmethod
+    def submit_items(cls, executor: ThreadPoolExecutor, items: List[Dict[str, Any]],
+                     processor: FileProcessor) -> List[Future]:
+        """将组内所有未下载的文件提交到线程池，每个任务只修改自身的item"""
+        return [
+            executor.submit(cls.process_item, item, processor)
+            for item in items
+            if not item.get('is_downloaded')
+        ]
+
     @classmethod
     def process_item(cls, item: Dict[str, Any], processor: FileProcessor) -> None:
         """处理单个文件下载"""
@@ -179,12 +514,12 @@ class DownloadManager:
 
         # 执行下载操作
         try:
-            logger.info(f"⏬ 开始下载: {item['file_name']}")
-            file_path = cls._download_file(item, processor)
+            logger.info("⏬ 开始下载: %s", item['file_name'])
+            file_size = cls._download_file(item, processor)
 
             # 处理下载成功
-            size_mb = cls._handle_download_success(item, file_path)
-            logger.info(f"✓ 下载成功: {item['file_name']} ({size_mb}MB)")
+            size_mb = cls._handle_download_success(item, file_size)
+            logger.info("✓ 下载成功: %s (%sMB)", item['file_name'], size_mb)
 
         except Exception as e:
             # 处理下载失败
@@ -193,7 +528,7 @@ class DownloadManager:
     @classmethod
     def _is_special_type(cls, item: Dict[str, Any]) -> bool:
         """检查是否为特殊类型（spaces/broadcasts）"""
-        return item.get('media_type') in ['spaces', 'broadcasts']
+        return item[_KIND_KEY] in _TEXT_KINDS
 
     @classmethod
     def _handle_special_type(cls, item: Dict[str, Any]) -> None:
@@ -206,11 +541,11 @@ class DownloadManager:
             "download_info": {
                 "success": True,
                 "size_mb": 0,
-                "timestamp": datetime.now().strftime(Config.INFO_DATE_FORMAT),
+                "timestamp": _now_iso(),
                 "download_attempts": 0
             }
         })
-        logger.info(f"⏭ 跳过特殊类型下载: {item['file_name']}")
+        logger.info("⏭ 跳过特殊类型下载: %s", item['file_name'])
 
     @classmethod
     def _should_skip_download(cls, item: Dict[str, Any]) -> bool:
@@ -219,8 +554,7 @@ class DownloadManager:
         if item.get('is_downloaded'):
             return True
 
-        download_info = item.setdefault('download_info', {})
-        current_attempts = download_info.get('download_attempts', 0)
+        current_attempts = item['download_info'].get('download_attempts', 0)
 
         # 达到最大尝试次数
         if current_attempts >= Config.MAX_DOWNLOAD_ATTEMPTS:
@@ -230,23 +564,48 @@ class DownloadManager:
 
         return False
 
+    @staticmethod
+    @retry(stop=stop_after_attempt(Config.DOWNLOAD_RETRY_ATTEMPTS),
+           wait=wait_exponential(multiplier=2, min=2, max=16) + wait_random(0, 1),
+           retry=retry_if_exception(_is_retryable_error),
+           before_sleep=before_sleep_log(logger, logging.WARNING),
+           reraise=True)
+    def _request_file(url: str) -> httpx.Response:
+        """发起下载请求，瞬时错误按指数退避重试"""
+        response = _CDN.send(_CDN.build_request('GET', url), stream=True)
+        try:
+            response.raise_for_status()
+        except httpx.HTTPStatusError:
+            response.close()
+            raise
+        return response
+
     @classmethod
-    def _download_file(cls, item: Dict[str, Any], processor: FileProcessor) -> Path:
-        """执行文件下载操作"""
-        response = requests.get(item['url'], stream=True, timeout=30)
-        response.raise_for_status()
+    def _download_file(cls, item: Dict[str, Any], processor: FileProcessor) -> int:
+        """执行文件下载操作，返回写入的字节数"""
+        # 仅对请求阶段重试，写入阶段的异常不会重新进入退避
+        response = cls._request_file(item['url'])
 
+        # 先写入临时文件，完成后原子替换，中断时不会留下不完整的目标文件
+        # 临时文件名与_item_key同样唯一（文件名+用户名+类型），同名文件（不同用户）并发下载时互不干扰
         file_path = processor.download_path / item['file_name']
-        with open(file_path, 'wb') as f:
-            for chunk in response.iter_content(chunk_size=8192):
-                f.write(chunk)
+        part_path = file_path.with_name(f"{file_path.name}.{item['user']['screen_name']}.{item['media_type']}.part")
+        bytes_written = 0
+        with closing(response):
+            try:
+                with open(part_path, 'wb', buffering=Config.DOWNLOAD_BUFFER_SIZE) as f:
+                    for chunk in response.iter_bytes(chunk_size=Config.DOWNLOAD_CHUNK_SIZE):
+                        bytes_written += f.write(chunk)
+                os.replace(part_path, file_path)
+            except BaseException:
+                part_path.unlink(missing_ok=True)
+                raise
 
-        return file_path
+        return bytes_written
 
     @classmethod
-    def _handle_download_success(cls, item: Dict[str, Any], file_path: Path) -> float:
+    def _handle_download_success(cls, item: Dict[str, Any], file_size: int) -> float:
         """处理下载成功的情况，返回文件大小（MB）"""
-        file_size = os.path.getsize(file_path)
         size_mb = round(file_size / 1024 / 1024, 2)
 
         item.update({
@@ -254,7 +613,8 @@ class DownloadManager:
             "download_info": {
                 "success": True,
                 "size_mb": size_mb,
-                "timestamp": datetime.now().strftime(Config.INFO_DATE_FORMAT),
+                "size_bytes": file_size,
+                "timestamp": _now_iso(),
                 "download_attempts": 0  # 重置计数器
             }
         })
@@ -263,7 +623,7 @@ class DownloadManager:
     @classmethod
     def _handle_download_failure(cls, item: Dict[str, Any], error: Exception) -> None:
         """处理下载失败的情况"""
-        download_info = item.setdefault('download_info', {})
+        download_info = item['download_info']
         current_attempts = download_info.get('download_attempts', 0)
         new_attempts = current_attempts + 1
 
@@ -272,17 +632,16 @@ class DownloadManager:
             "success": False,
             "error_type": "download_error",
             "message": str(error),
-            "timestamp": datetime.now().strftime(Config.INFO_DATE_FORMAT),
+            "timestamp": _now_iso(),
             "download_attempts": new_attempts
         })
 
         # 错误日志
-        truncated_error = str(error)[:Config.ERROR_TRUNCATE]
-        error_msg = f"✗ 下载失败: {item['file_name']} - {truncated_error} (尝试 {new_attempts}/{Config.MAX_DOWNLOAD_ATTEMPTS})"
-        logger.error(error_msg)
+        logger.error("✗ 下载失败: %s - %s (尝试 %s/%s)", item['file_name'],
+                     str(error)[:Config.ERROR_TRUNCATE], new_attempts, Config.MAX_DOWNLOAD_ATTEMPTS)
 
         # 调试日志
-        logger.debug(f"✗ 下载失败详情: {item['file_name']} - {str(error)}")
+        logger.debug("✗ 下载失败详情: %s - %s", item['file_name'], error)
 
     @classmethod
     def _handle_max_attempts(cls, item: Dict[str, Any]) -> None:
@@ -295,27 +654,23 @@ class DownloadManager:
             "notification_sent": False
         }
 
-        # 如果已有upload_info，复用其中的某些字段
-        if 'upload_info' in item and isinstance(item['upload_info'], dict):
-            existing_info = item['upload_info']
-
-            # 保留已有的时间戳（如果有）
-            if 'timestamp' in existing_info:
-                new_info['timestamp'] = existing_info['timestamp']
-            else:
-                new_info['timestamp'] = datetime.now().strftime(Config.INFO_DATE_FORMAT)
+        # 复用已有upload_info中的某些字段（加载时已保证为dict）
+        existing_info = item['upload_info']
 
-            # 保留已有的通知状态（如果有）
-            if 'notification_sent' in existing_info:
-                new_info['notification_sent'] = existing_info['notification_sent']
+        # 保留已有的时间戳（如果有），否则创建新的时间戳
+        if 'timestamp' in existing_info:
+            new_info['timestamp'] = existing_info['timestamp']
         else:
-            # 没有已有信息，创建新的时间戳
-            new_info['timestamp'] = datetime.now().strftime(Config.INFO_DATE_FORMAT)
+            new_info['timestamp'] = _now_iso()
+
+        # 保留已有的通知状态（如果有）
+        if 'notification_sent' in existing_info:
+            new_info['notification_sent'] = existing_info['notification_sent']
 
         # 更新或创建upload_info
         item['upload_info'] = new_info
 
-        logger.warning(f"⏭ 已达最大下载尝试次数: {item['file_name']}")
+        logger.warning("⏭ 已达最大下载尝试次数: %s", item['file_name'])
 
 
 # --------------------------
@@ -324,8 +679,9 @@ class DownloadManager:
 class UploadManager:
     """上传管理器"""
 
-    def __init__(self):
+    def __init__(self, alerts: AlertQueue):
         self._initialize_bot()
+        self.alerts = alerts  # 告警缓冲队列
         self.strategies = {
             'text': self._handle_text_upload,
             'single': self._handle_single_media,
@@ -335,16 +691,17 @@ class UploadManager:
 
     def _initialize_bot(self):
         """初始化Telegram机器人"""
-        env_vars = Config.get_env_vars()
-        if not env_vars['bot_token'] or not env_vars['chat_id']:
+        if not EnvConfig.BOT_TOKEN or not EnvConfig.CHAT_ID:
             logger.error("❌ 必须配置 BOT_TOKEN 和 CHAT_ID 环境变量！")
             sys.exit(1)
-        self.bot = telegram.Bot(token=env_vars['bot_token'])
-        self.chat_id = env_vars['chat_id']
+        # 复用连接池，保持与Telegram API的长连接
+        request = Request(con_pool_size=Config.TELEGRAM_POOL_SIZE)
+        self.bot = telegram.Bot(token=EnvConfig.BOT_TOKEN, request=request)
+        self.chat_id = EnvConfig.CHAT_ID
 
     def process_items(self, items: List[Dict[str, Any]], processor: FileProcessor) -> None:
         """
-        处理待上传项的主入口
+        处理待上传项的主入口（items为同一推文的分组）
         """
         # 保存处理器引用，供后续使用
         self.processor = processor
@@ -360,13 +717,7 @@ class UploadManager:
         # 按策略类型处理
         for strategy_type, items_to_upload in strategy_map.items():
             try:
-                if strategy_type == 'group':
-                    # 按推文分组处理媒体组
-                    grouped_items = self._group_by_tweet_id(items_to_upload)
-                    for tweet_items in grouped_items:
-                        self.strategies[strategy_type](tweet_items, processor)
-                else:
-                    self.strategies[strategy_type](items_to_upload, processor)
+                self.strategies[strategy_type](items_to_upload, processor)
             except Exception as e:
                 self._handle_strategy_error(e, items_to_upload, strategy_type)
 
@@ -383,7 +734,7 @@ class UploadManager:
         if self._has_unrecoverable_error(item):
             return False
         # 特殊类型（文本）可直接上传
-        if item.get('media_type') in ['spaces', 'broadcasts']:
+        if item[_KIND_KEY] in _TEXT_KINDS:
             return True
         # 常规类型需要下载成功
         return item.get('is_downloaded', False)
@@ -395,18 +746,18 @@ class UploadManager:
         - 'single': 单媒体项
         - 'group': 媒体组项
         """
+        # 待上传项同属一条推文，媒体项数量决定策略
+        media_count = sum(1 for item in items if item[_KIND_KEY] in _MEDIA_KINDS)
         strategy_map = defaultdict(list)
 
         for item in items:
-            media_type = item['media_type']
+            kind = item[_KIND_KEY]
 
-            if media_type in ['spaces', 'broadcasts']:
+            if kind in _TEXT_KINDS:
                 strategy_map['text'].append(item)
 
-            elif media_type in ['images', 'videos']:
+            elif kind in _MEDIA_KINDS:
                 # 对媒体文件进行分组（媒体数量决定策略）
-                media_count = self._get_media_count_in_tweet(items, item['tweet_id'])
-
                 if media_count == 1:
                     strategy_map['single'].append(item)
                 else:
@@ -414,22 +765,6 @@ class UploadManager:
 
         return dict(strategy_map)
 
-    def _get_media_count_in_tweet(self, all_items: List[Dict[str, Any]], tweet_id: str) -> int:
-        """获取同一推文中的媒体项数量"""
-        return sum(
-            1 for item in all_items
-            if item['tweet_id'] == tweet_id
-            and item['media_type'] in ['images', 'videos']
-            and not item.get('is_uploaded')
-        )
-
-    def _group_by_tweet_id(self, items: List[Dict[str, Any]]) -> List[List[Dict[str, Any]]]:
-        """按推文ID分组项"""
-        grouped = defaultdict(list)
-        for item in items:
-            grouped[item['tweet_id']].append(item)
-        return list(grouped.values())
-
     # --------------------------
     # 上传策略实现
     # --------------------------
@@ -449,111 +784,113 @@ class UploadManager:
     def _handle_media_group(self, items: List[Dict[str, Any]], processor: FileProcessor) -> None:
         """处理媒体组上传策略"""
         tweet_id = items[0]['tweet_id']
-        logger.info(f"🖼️ 准备媒体组上传: {tweet_id} ({len(items)}个文件)")
+        logger.info("🖼️ 准备媒体组上传: %s (%s个文件)", tweet_id, len(items))
 
         # 提前检查媒体组大小
-        if self._is_group_size_exceeded(items):
-            logger.warning(f"⚠️ 媒体组过大({self._get_group_size_mb(items)}MB > 50MB)，回退为单文件上传")
+        group_size_mb = self._get_group_size_mb(items)
+        if self._is_group_size_exceeded(group_size_mb):
+            logger.warning("⚠️ 媒体组过大(%sMB > 50MB)，回退为单文件上传", group_size_mb)
             self._fallback_to_single_upload(items)
             return
 
         # 构建媒体组
-        media_group, included_items = self._prepare_media_group(items, processor)
-
-        if not media_group:
-            logger.warning(f"⏭ 无可上传的有效媒体: {tweet_id}")
-            return
+        media_group, included_items, file_stack = self._prepare_media_group(items, processor)
 
-        try:
-            # 发送媒体组
-            messages = self.bot.send_media_group(
-                chat_id=self.chat_id,
-                media=media_group
-            )
+        # 媒体组发送结束后统一关闭所有文件句柄
+        with file_stack:
+            if not media_group:
+                logger.warning("⏭ 无可上传的有效媒体: %s", tweet_id)
+                return
 
-            # 验证响应
-            if len(messages) != len(included_items):
-                logger.warning(
-                    f"⚠️ 返回消息数量({len(messages)})与媒体组数量({len(included_items)})不匹配，将回退为单文件上传"
+            try:
+                # 发送媒体组
+                messages = self.bot.send_media_group(
+                    chat_id=self.chat_id,
+                    media=media_group
                 )
-                # 使用回退机制处理不匹配情况
-                self._fallback_to_single_upload(included_items)
+            except Exception as e:
+                self._handle_group_upload_error(e, included_items)
                 return
 
-            # 更新状态
-            for msg, item in zip(messages, included_items):
-                msg_id = msg.message_id
-                self._update_upload_status(item, msg_id)
-                logger.info(f"✅ 上传成功: {item['file_name']}({msg_id})")
-
-            logger.info(f"✅ 媒体组上传成功: {tweet_id} ({len(media_group)}个文件)")
+        # 验证响应
+        if len(messages) != len(included_items):
+            logger.warning("⚠️ 返回消息数量(%s)与媒体组数量(%s)不匹配，将回退为单文件上传",
+                           len(messages), len(included_items))
+            # 使用回退机制处理不匹配情况
+            self._fallback_to_single_upload(included_items)
+            return
 
-        except Exception as e:
-            self._handle_group_upload_error(e, included_items)
+        # 更新状态（同一媒体组共用一个时间戳）
+        timestamp = _now_iso()
+        for msg, item in zip(messages, included_items):
+            msg_id = msg.message_id
+            self._update_upload_status(item, msg_id, timestamp)
+            logger.info("✅ 上传成功: %s(%s)", item['file_name'], msg_id)
 
-        finally:
-            # 确保关闭所有文件句柄
-            for media_item in media_group:
-                if hasattr(media_item, 'media') and hasattr(media_item.media, 'close'):
-                    media_item.media.close()
+        logger.info("✅ 媒体组上传成功: %s (%s个文件)", tweet_id, len(media_group))
 
     # --------------------------
     # 媒体组大小检测和回退
     # --------------------------
     def _handle_strategy_error(self, error: Exception, items: List[Dict[str, Any]], strategy_type: str) -> None:
         """处理策略级错误，优化媒体组处理逻辑"""
-        logger.error(f"✗ {strategy_type}策略执行失败: {str(error)[:Config.ERROR_TRUNCATE]}")
-        logger.debug(f"✗ {strategy_type}策略执行失败详情: {str(error)}")
-
-        # 对于媒体组错误，检查大小决定是否回退
-        if strategy_type == 'group' and self._is_group_size_exceeded(items):
-            logger.warning(f"⚠️ 媒体组过大({self._get_group_size_mb(items)}MB > 50MB)，回退为单文件上传")
+        logger.error("✗ %s策略执行失败: %s", strategy_type, str(error)[:Config.ERROR_TRUNCATE])
+        logger.debug("✗ %s策略执行失败详情: %s", strategy_type, error)
+
+        # 媒体组错误一律回退为单文件上传，超过大小限制时额外提示
+        if strategy_type == 'group':
+            group_size_mb = self._get_group_size_mb(items)
+            if self._is_group_size_exceeded(group_size_mb):
+                logger.warning("⚠️ 媒体组过大(%sMB > 50MB)，回退为单文件上传", group_size_mb)
             self._fallback_to_single_upload(items)
-        elif strategy_type in ['group', 'text']:
-            # 其他类型的媒体组错误也尝试回退
+        elif strategy_type == 'text':
+            # 文本项错误也尝试回退
             self._fallback_to_single_upload(items)
 
-    def _is_group_size_exceeded(self, items: List[Dict[str, Any]]) -> bool:
+    def _is_group_size_exceeded(self, group_size_mb: float) -> bool:
         """检查媒体组总大小是否超过50MB限制"""
-        return self._get_group_size_mb(items) > Config.TELEGRAM_LIMITS['videos'] / (1024 * 1024)
+        return group_size_mb > _GROUP_SIZE_LIMIT_MB
 
     def _get_group_size_mb(self, items: List[Dict[str, Any]]) -> float:
         """计算媒体组总大小（MB）"""
         total_size_bytes = 0
 
         for item in items:
-            if 'download_info' in item and 'size_mb' in item['download_info']:
-                # 使用已有大小信息
-                total_size_bytes += item['download_info']['size_mb'] * 1024 * 1024
+            download_info = item['download_info']
+            if 'size_bytes' in download_info:
+                # 使用下载时记录的字节数
+                total_size_bytes += download_info['size_bytes']
+            elif 'size_mb' in download_info:
+                # 旧数据只有MB大小
+                total_size_bytes += download_info['size_mb'] * 1024 * 1024
             else:
-                # 尝试从文件系统获取大小
+                # 尝试从文件系统获取大小（单次stat）
                 try:
-                    file_path = self.processor.download_path / item['file_name']
-                    if file_path.exists():
-                        total_size_bytes += os.path.getsize(file_path)
-                except Exception:
+                    total_size_bytes += os.path.getsize(self.processor.download_path / item['file_name'])
+                except OSError:
                     continue
 
         return round(total_size_bytes / (1024 * 1024), 2)
 
     def _fallback_to_single_upload(self, items: List[Dict[str, Any]]) -> None:
         """回退为单文件上传策略"""
-        logger.info(f"⏮️ 回退为单文件上传: {items[0]['tweet_id']} ({len(items)}个文件)")
+        logger.info("⏮️ 回退为单文件上传: %s (%s个文件)", items[0]['tweet_id'], len(items))
 
         for item in items:
             if item.get('is_uploaded'):
                 continue
 
             try:
-                if item['media_type'] in ['spaces', 'broadcasts']:
+                if item[_KIND_KEY] in _TEXT_KINDS:
                     self._upload_text_item(item)
                 else:
                     self._upload_media_item(item, self.processor)
             except Exception as inner_error:
                 self._update_error_status(inner_error, item)
                 self._reset_download_status(item)
-                logger.error(f"✗ 单文件上传失败: {item['file_name']} - {str(inner_error)[:Config.ERROR_TRUNCATE]}")
-                logger.debug(f"✗ 单文件上传失败详情: {item['file_name']} - {str(inner_error)}")
+                logger.error("✗ 单文件上传失败: %s - %s",
+                             item['file_name'], str(inner_error)[:Config.ERROR_TRUNCATE])
+                logger.debug("✗ 单文件上传失败详情: %s - %s", item['file_name'], inner_error)
 
     # --------------------------
     # 实际上传操作
@@ -567,10 +904,10 @@ class UploadManager:
         self._update_upload_status(item, msg_id)
 
         # 发送飞书通知
-        if Config.get_env_vars()['lark_key']:
+        if EnvConfig.LARK_KEY:
             Notifier.send_lark_message(caption)
 
-        logger.info(f"✅ 发送成功: {item['file_name']}({msg_id})")
+        logger.info("✅ 发送成功: %s(%s)", item['file_name'], msg_id)
 
     def _upload_media_item(self, item: Dict[str, Any], processor: FileProcessor) -> None:
         """上传单个媒体文件"""
@@ -578,51 +915,52 @@ class UploadManager:
             # 媒体型caption构建
             caption = self._build_media_caption(item)
 
-            if item['media_type'] == 'images':
+            if item[_KIND_KEY] == MediaKind.IMAGE:
                 msg = self.bot.send_photo(chat_id=self.chat_id, photo=file_obj, caption=caption)
             else:  # videos
                 msg = self.bot.send_video(chat_id=self.chat_id, video=file_obj, caption=caption)
 
             msg_id = msg.message_id
             self._update_upload_status(item, msg_id)
-            logger.info(f"✅ 上传成功: {item['file_name']}({msg_id})")
+            logger.info("✅ 上传成功: %s(%s)", item['file_name'], msg_id)
 
     def _prepare_media_group(self, items: List[Dict[str, Any]], processor: FileProcessor
-                             ) -> Tuple[List[telegram.InputMedia], List[Dict[str, Any]]]:
+                             ) -> Tuple[List[telegram.InputMedia], List[Dict[str, Any]], ExitStack]:
         """
         准备媒体组上传
-        返回：媒体组对象列表, 包含的原始项列表
+        返回：媒体组对象列表, 包含的原始项列表, 持有已打开文件的ExitStack（由调用方在发送后关闭）
         """
         media_group = []
         included_items = []
         tweet_id = items[0]['tweet_id']
+        file_stack = ExitStack()
 
         for idx, item in enumerate(items):
             if item.get('is_uploaded'):
                 continue
 
             try:
-                with self._get_file_handle(item, processor) as file_obj:
-                    # 仅第一项添加caption
-                    caption = self._build_media_caption(item) if idx == 0 else None
+                file_obj = file_stack.enter_context(self._get_file_handle(item, processor))
+                # 仅第一项添加caption
+                caption = self._build_media_caption(item) if idx == 0 else None
 
-                    if item['media_type'] == 'images':
-                        media_item = telegram.InputMediaPhoto(file_obj, caption=caption)
-                    else:  # videos
-                        media_item = telegram.InputMediaVideo(file_obj, caption=caption)
+                if item[_KIND_KEY] == MediaKind.IMAGE:
+                    media_item = telegram.InputMediaPhoto(file_obj, caption=caption)
+                else:  # videos
+                    media_item = telegram.InputMediaVideo(file_obj, caption=caption)
 
-                    media_group.append(media_item)
-                    included_items.append(item)
+                media_group.append(media_item)
+                included_items.append(item)
 
-                    # 检查媒体组文件数限制
-                    if len(media_group) >= Config.TELEGRAM_LIMITS['media_group']:
-                        logger.warning(f"⚠️ 媒体组文件数达到上限: {tweet_id}")
-                        break
+                # 检查媒体组文件数限制
+                if len(media_group) >= _MEDIA_GROUP_LIMIT:
+                    logger.warning("⚠️ 媒体组文件数达到上限: %s", tweet_id)
+                    break
 
             except Exception as e:
                 self._handle_preparation_error(e, item)
 
-        return media_group, included_items
+        return media_group, included_items, file_stack
 
     # --------------------------
     # caption构建系统
@@ -636,12 +974,14 @@ class UploadManager:
         """
         username = item['user']['screen_name']
         media_type = item['media_type']
-        publish_time = datetime.fromisoformat(item['publish_time']).strftime(Config.MESSAGE_DATE_FORMAT)
+        publish_time = _fmt_publish_time(item['publish_time'])
         url = item['url']
 
         # 组合文本元素
         content = f"#{username} #{media_type}\n{publish_time}\n{url}"
-        return self._truncate_text(content, Config.TELEGRAM_LIMITS['caption'])
+        if len(content) <= _CAPTION_LIMIT:
+            return content
+        return self._truncate_text(content, _CAPTION_LIMIT)
 
     def _build_media_caption(self, item: Dict[str, Any]) -> str:
         """
@@ -652,22 +992,26 @@ class UploadManager:
         """
         screen_name = item['user']['screen_name']
         display_name = item['user']['name']
-        publish_time = datetime.fromisoformat(item['publish_time']).strftime(Config.MESSAGE_DATE_FORMAT)
+        publish_time = _fmt_publish_time(item['publish_time'])
 
         # 组合基本信息
         base_info = f"#{screen_name} {display_name}\n{publish_time}"
 
-        # 添加推文内容
-        text_content = f"{base_info}\n{item.get('full_text', '')}"
-        return self._truncate_text(text_content, Config.TELEGRAM_LIMITS['caption'])
+        # 添加推文内容（常见的短文本无需截断，直接返回）
+        full_text = item.get('full_text', '')
+        text_budget = _CAPTION_LIMIT - len(base_info) - 1
+        if len(full_text) <= text_budget:
+            return f"{base_info}\n{full_text}"
+        # 超长文本只拼接会被保留的前缀（多留1个字符以触发截断）
+        return self._truncate_text(f"{base_info}\n{full_text[:text_budget + 1]}", _CAPTION_LIMIT)
 
     def _truncate_text(self, text: str, max_length: int) -> str:
         """智能截断文本"""
         if len(text) > max_length:
-            truncated = text[:max_length - 3]
+            last_period = text.rfind('.', 0, max_length - 3)
             # 确保截断在完整句子后
-            if truncated.rfind('.') > max_length - 10:
-                truncate_point = truncated.rfind('.') + 1
+            if last_period > max_length - 10:
+                truncate_point = last_period + 1
             else:
                 truncate_point = max_length - 3
             return text[:truncate_point] + "..."
@@ -678,7 +1022,7 @@ class UploadManager:
     # --------------------------
     def _get_file_handle(self, item: Dict[str, Any], processor: FileProcessor) -> BinaryIO:
         """获取文件句柄并进行大小验证"""
-        if item.get('media_type') in ['spaces', 'broadcasts']:
+        if item[_KIND_KEY] in _TEXT_KINDS:
             # 特殊类型直接返回URL
             return item['url']
 
@@ -686,24 +1030,27 @@ class UploadManager:
         file_path = processor.download_path / item['file_name']
         media_type = item['media_type']
 
-        # 检查文件大小
-        file_size = os.path.getsize(file_path)
-        if file_size > Config.TELEGRAM_LIMITS[media_type]:
+        # 检查文件大小（优先使用下载时记录的大小，旧数据回退到stat）
+        file_size = item['download_info'].get('size_bytes')
+        if file_size is None:
+            file_size = os.path.getsize(file_path)
+        size_limit = _LIMIT_IMAGES if item[_KIND_KEY] == MediaKind.IMAGE else _LIMIT_VIDEOS
+        if file_size > size_limit:
             raise FileTooLargeError(
                 f"{media_type}大小超标 ({file_size / (1024 * 1024):.2f}MB > "
-                f"{Config.TELEGRAM_LIMITS[media_type] / (1024 * 1024):.2f}MB)"
+                f"{size_limit / (1024 * 1024):.2f}MB)"
             )
 
         return open(file_path, 'rb')
 
-    def _update_upload_status(self, item: Dict[str, Any], message_id: int) -> None:
-        """更新上传状态为成功"""
+    def _update_upload_status(self, item: Dict[str, Any], message_id: int, timestamp: Optional[str] = None) -> None:
+        """更新上传状态为成功，timestamp 未指定时取当前时间"""
         item.update({
             "is_uploaded": True,
             "upload_info": {
                 "success": True,
                 "message_id": message_id,
-                "timestamp": datetime.now().strftime(Config.INFO_DATE_FORMAT)
+                "timestamp": timestamp or _now_iso()
             }
         })
 
@@ -712,10 +1059,10 @@ class UploadManager:
     # --------------------------
     def _has_unrecoverable_error(self, item: Dict[str, Any]) -> bool:
         """检查不可恢复错误"""
-        upload_info = item.get('upload_info', {})
+        upload_info = item['upload_info']
         error_type = upload_info.get('error_type')
 
-        if error_type in ['file_too_large', 'max_download_attempts']:
+        if error_type in _UNRECOVERABLE_ERRORS:
             # 发送通知（如果尚未发送）
             if not upload_info.get('notification_sent'):
                 self._send_unrecoverable_alert(item, error_type)
@@ -725,7 +1072,7 @@ class UploadManager:
 
     def _send_unrecoverable_alert(self, item: Dict[str, Any], error_type: str) -> None:
         """发送不可恢复错误通知"""
-        Notifier.send_lark_alert(
+        self.alerts.push(
             f"🔴 推送失败\n文件名: {item['file_name']}\n"
             f"类型: {error_type}\n"
             f"错误: {item['upload_info']['message'][:Config.ERROR_TRUNCATE]}"
@@ -735,8 +1082,8 @@ class UploadManager:
         """处理单文件上传错误"""
         self._update_error_status(error, item)
         self._reset_download_status(item)
-        logger.error(f"✗ 单文件上传失败: {item['file_name']} - {str(error)[:Config.ERROR_TRUNCATE]}")
-        logger.debug(f"✗ 单文件上传失败详情: {item['file_name']} - {str(error)}")
+        logger.error("✗ 单文件上传失败: %s - %s", item['file_name'], str(error)[:Config.ERROR_TRUNCATE])
+        logger.debug("✗ 单文件上传失败详情: %s - %s", item['file_name'], error)
 
     def _handle_group_upload_error(self, error: Exception, items: List[Dict[str, Any]]) -> None:
         """处理媒体组上传错误"""
@@ -744,14 +1091,14 @@ class UploadManager:
             self._update_error_status(error, item)
             self._reset_download_status(item)
         tweet_id = items[0]['tweet_id'] if items else "未知"
-        logger.error(f"✗ 媒体组上传失败: {tweet_id} - {str(error)[:Config.ERROR_TRUNCATE]}")
-        logger.debug(f"✗ 媒体组上传失败详情: {tweet_id} - {str(error)}")
+        logger.error("✗ 媒体组上传失败: %s - %s", tweet_id, str(error)[:Config.ERROR_TRUNCATE])
+        logger.debug("✗ 媒体组上传失败详情: %s - %s", tweet_id, error)
 
     def _handle_preparation_error(self, error: Exception, item: Dict[str, Any]) -> None:
         """处理媒体组准备过程中的错误"""
         self._update_error_status(error, item)
         self._reset_download_status(item)
-        logger.warning(f"✗ 媒体组准备失败: {item['file_name']}")
+        logger.warning("✗ 媒体组准备失败: %s", item['file_name'])
 
     def _update_error_status(self, error: Exception, item: Dict[str, Any]) -> None:
         """更新错误状态"""
@@ -761,13 +1108,13 @@ class UploadManager:
             "success": False,
             "error_type": error_type,
             "message": str(error),
-            "timestamp": datetime.now().strftime(Config.INFO_DATE_FORMAT),
+            "timestamp": _now_iso(),
             "notification_sent": False
         }
 
         # 对于非文件大小错误，立即通知
         if error_type != 'file_too_large':
-            Notifier.send_lark_alert(
+            self.alerts.push(
                 f"🔴 上传失败\n文件名: {item['file_name']}\n"
                 f"错误类型: {error.__class__.__name__}\n"
                 f"错误详情: {str(error)[:Config.ERROR_TRUNCATE]}"
@@ -782,58 +1129,124 @@ class UploadManager:
 # --------------------------
 # 主流程
 # --------------------------
+def _process_groups(groups: Iterable[List[Dict[str, Any]]], download_manager: DownloadManager,
+                    upload_manager: UploadManager, processor: FileProcessor) -> None:
+    """
+    所有分组的下载任务提交到同一个线程池并发执行，再按分组顺序提交上传
+    每个分组只等待自身的下载完成，后续分组的下载与当前分组的上传重叠进行
+    默认单线程上传，严格按分组顺序串行，保证频道内消息顺序；
+    Config.UPLOAD_WORKERS 大于1时多个分组并发上传
+    任一分组失败后不再开始新的分组上传，已开始的分组在上传线程内记录状态
+    """
+    executor = ThreadPoolExecutor(max_workers=Config.DOWNLOAD_WORKERS)
+    uploader = ThreadPoolExecutor(max_workers=Config.UPLOAD_WORKERS)
+    abort = threading.Event()
+
+    def upload_group(items: List[Dict[str, Any]], downloads: List[Future]) -> None:
+        try:
+            # 等待当前分组下载完成（各分组的item互不相交）
+            for download in downloads:
+                download.result()
+
+            # 已中止时不再推送
+            if abort.is_set():
+                return
+
+            # 分组上传策略
+            upload_manager.process_items(items, processor)
+        except BaseException:
+            abort.set()
+            raise
+        finally:
+            # 记录分组状态（含失败前已推送的项），中断后可恢复
+            processor.record_items(items)
+
+    try:
+        # 按分组顺序提交，线程池先进先出，靠前的分组优先下载、优先上传
+        scheduled = [(items, download_manager.submit_items(executor, items, processor)) for items in groups]
+        uploads = [uploader.submit(upload_group, items, downloads) for items, downloads in scheduled]
+
+        for upload in uploads:
+            upload.result()
+    except BaseException:
+        # 处理中断时先取消尚未开始的下载，再等待进行中的上传结束
+        abort.set()
+        executor.shutdown(wait=False, cancel_futures=True)
+        uploader.shutdown(wait=True, cancel_futures=True)
+        executor.shutdown(wait=True)
+        raise
+    else:
+        uploader.shutdown(wait=True)
+        executor.shutdown(wait=True)
+
+
 def process_single(json_path: str, download_dir: str = Config.DEFAULT_DOWNLOAD_DIR) -> None:
     """处理单个文件"""
+    alerts = AlertQueue()
+    processor = None
     try:
-        logger.info(f"\n{'-' * 40}\n🔍 开始处理: {json_path}")
+        logger.info("\n%s\n🔍 开始处理: %s", '-' * 40, json_path)
         processor = FileProcessor(json_path, download_dir)
         data = processor.load_data()
 
-        # 1. 按tweet_id分组数据
-        grouped_items = defaultdict(list)
-        for item in data:
-            if 'tweet_id' not in item:
-                logger.error(f"⚠️ 数据项缺少tweet_id: 文件名={item.get('file_name', '未知')}, 跳过")
-                continue
+        # 1. 分组已在加载时完成：组顺序取该推文首次出现的位置，组内保持原有顺序
+        for item in processor.no_tweet_id:
+            logger.error("⚠️ 数据项缺少tweet_id: 文件名=%s, 跳过", item.get('file_name', '未知'))
 
-            grouped_items[item['tweet_id']].append(item)
+        # 全部处理完毕时直接返回，无需创建下载/上传管理器
+        if not processor.has_pending_items():
+            # 仅回放了变更日志时仍需写回JSON
+            if processor.dirty:
+                processor.save_data(data)
+            logger.info("⏭ 无待处理项，跳过: %s\n%s\n", json_path, '-' * 40)
+            return
 
         download_manager = DownloadManager()
-        upload_manager = UploadManager()
+        upload_manager = UploadManager(alerts)
 
-        logger.info(f"📊 检测到 {len(grouped_items)} 个推文分组")
+        logger.info("📊 检测到 %s 个推文分组", len(processor.grouped))
 
-        # 2. 按分组处理
-        for tweet_id, items in grouped_items.items():
-            # 2.1 下载组内所有未下载的文件
-            for item in items:
-                if not item.get('is_downloaded'):
-                    download_manager.process_item(item, processor)
-
-            # 2.2 分组上传策略
-            upload_manager.process_items(items, processor)
+        # 2. 分组处理：并发下载，按顺序上传
+        _process_groups(processor.grouped.values(), download_manager, upload_manager, processor)
 
-        processor.save_data(data)
-        logger.info(f"✅ 文件处理完成\n{'-' * 40}\n")
+        # 仅在数据有变化时重写JSON
+        if processor.dirty:
+            processor.save_data(data)
+        else:
+            logger.info("⏭ 数据无变化，跳过保存")
+        logger.info("✅ 文件处理完成\n%s\n", '-' * 40)
 
     except Exception as e:
-        logger.error(f"💥 处理异常: {str(e)}", exc_info=True)
+        logger.error("💥 处理异常: %s", e, exc_info=True)
         Notifier.send_lark_alert(f"处理异常: {str(e)[:Config.NOTIFICATION_TRUNCATE]}")
         raise
 
+    finally:
+        # 发送本次处理中缓冲的告警
+        alerts.flush()
+        # 异常退出时保留已写入的变更日志，供下次回放
+        if processor is not None:
+            processor.close_wal()
+
 
 def batch_process(days: int = 7) -> None:
     """批量处理"""
     base_dir = Path(Config.DEFAULT_OUTPUT_DIR)
-    for i in range(days, -1, -1):  # 倒序处理
-        target_date = datetime.now() - timedelta(days=i)
-        date_str = target_date.strftime("%Y-%m-%d")
-        json_path = base_dir / f"{date_str[:7]}/{date_str}.json"
+    now = datetime.now()
+    month_files: Dict[str, set] = {}  # 每个月份目录只列举一次
 
-        if json_path.exists():
+    for i in range(days, -1, -1):  # 倒序处理
+        date_str = (now - timedelta(days=i)).strftime("%Y-%m-%d")
+        month = date_str[:7]
+        if month not in month_files:
+            month_dir = base_dir / month
+            month_files[month] = {p.name for p in month_dir.glob('*.json')} if month_dir.is_dir() else set()
+
+        json_path = base_dir / f"{month}/{date_str}.json"
+        if f"{date_str}.json" in month_files[month]:
             process_single(str(json_path))
         else:
-            logger.info(f"⏭ 跳过不存在文件: {json_path}")
+            logger.debug("⏭ 跳过不存在文件: %s", json_path)
 
 
 def main():
@@ -862,5 +1275,8 @@ if __name__ == "__main__":
         logger.warning("⏹️ 用户中断操作")
         sys.exit(0)
     except Exception as e:
-        logger.error(f"💥 未处理的异常: {str(e)}")
+        logger.error("💥 未处理的异常: %s", e)
         sys.exit(1)
+    finally:
+        # 等待后台通知发送完毕
+        Notifier.shutdown()